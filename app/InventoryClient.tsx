@@ -1,58 +1,200 @@
 'use client';
 
-import { useState, useEffect } from 'react';
-import { supabase } from './page';
+import { useState, useEffect, useMemo, useCallback, memo } from 'react';
+import { supabase } from './supabase';
 import { format } from 'date-fns';
 
 interface Item { id: number; location: string; item: string; notes: string | null; quantity: number; }
 interface Tx { id: number; item: string; action: string; user: string; timestamp: string; qty: number; }
 
+const ITEM_COLS = 'id, location, item, notes, quantity';
+const TX_COLS = 'id, item, action, user, timestamp, qty';
+const PAGE_SIZE = 25;
+// 1–3 digit cabinet + drawer letter, ignoring case and any separators around them ("5a", " 12-B ").
+const LOC_PATTERN = /^[^0-9a-z]*(\d{1,3})[^0-9a-z]*([a-z])[^0-9a-z]*$/i;
+const QTY_PATTERN = /^\s*\d+\s*$/;
+
+function cleanLocation(raw: string): string | null {
+  const m = LOC_PATTERN.exec(raw);
+  return m ? m[1] + m[2].toUpperCase() : null;
+}
+
+async function fetchItems(): Promise<Item[]> {
+  const { data } = await supabase.from('inventory').select(ITEM_COLS).order('location');
+  return data || [];
+}
+
+async function fetchTxs(): Promise<Tx[]> {
+  const { data } = await supabase.from('transactions').select(TX_COLS).order('timestamp', { ascending: false }).limit(100);
+  return data || [];
+}
+
+// Quotes a CSV field when it contains a delimiter, quote or line break, doubling embedded quotes.
+function csvField(value: string | number): string {
+  const s = String(value);
+  return /[",\r\n]/.test(s) ? `"${s.replace(/"/g, '""')}"` : s;
+}
+
+interface ParsedRow { line: number; fields: string[]; open: boolean; }
+
+// Splits pasted CSV/TSV text into records, honouring quoted fields (which may hold the delimiter,
+// doubled quotes or line breaks). `line` is the 1-based line the record starts on in the input, and
+// `open` marks a record whose quote was never closed. Blank records are dropped.
+function parseRows(text: string): ParsedRow[] {
+  const sep = text.includes('\t') ? '\t' : ',';
+  const rows: ParsedRow[] = [];
+  let fields: string[] = [];
+  let field = '';
+  let quoted = false;
+  let line = 1;
+  let start = 1;
+
+  for (let i = 0; i < text.length; i++) {
+    const c = text[i];
+    if (quoted) {
+      if (c === '"' && text[i + 1] === '"') { field += '"'; i++; }
+      else if (c === '"') quoted = false;
+      else { if (c === '\n') line++; field += c; }
+    } else if (c === '"' && !field.trim()) {
+      field = ''; quoted = true;
+    } else if (c === sep) {
+      fields.push(field); field = '';
+    } else if (c === '\n' || c === '\r') {
+      if (c === '\r' && text[i + 1] === '\n') i++;
+      fields.push(field);
+      rows.push({ line: start, fields, open: false });
+      fields = []; field = ''; start = ++line;
+    } else {
+      field += c;
+    }
+  }
+  fields.push(field);
+  rows.push({ line: start, fields, open: quoted });
+  return rows.filter(r => r.open || r.fields.some(f => f.trim()));
+}
+
+// Array.prototype.sort is stable, so rows sharing a location keep their existing order.
+function byLocation(a: Item, b: Item): number {
+  return a.location < b.location ? -1 : a.location > b.location ? 1 : 0;
+}
+
+// Keeps the list in the same order fetchItems() returns (by location) without refetching it.
+function insertSorted(items: Item[], row: Item): Item[] {
+  const i = items.findIndex(it => it.location > row.location);
+  return i === -1 ? [...items, row] : [...items.slice(0, i), row, ...items.slice(i)];
+}
+
+// Memoized so notes saves and check-ins re-render only the row that changed.
+const ItemRow = memo(function ItemRow({ row, onNotes, onAction }: {
+  row: Item;
+  onNotes: (row: Item, notes: string) => void;
+  onAction: (row: Item, action: string, user: string, qty: number) => void;
+}) {
+  return (
+    <details className="border p-4 bg-white rounded shadow">
+      <summary className="font-bold text-lg cursor-pointer">
+        {row.item} @ {row.location} — Qty: {row.quantity}
+      </summary>
+      <div className="mt-3 grid grid-cols-1 md:grid-cols-2 gap-3 text-sm">
+        <textarea defaultValue={row.notes || ''} onBlur={e => onNotes(row, e.target.value)} className="p-2 border rounded" rows={2} />
+        <form
+          onSubmit={e => {
+            e.preventDefault();
+            const f = e.target as HTMLFormElement;
+            const qty = parseInt(f.qty.value || '1');
+            if (f.act.value !== 'None' && f.user.value) onAction(row, f.act.value, f.user.value, qty);
+          }}
+          className="space-y-1"
+        >
+          <select name="act" defaultValue="None" className="w-full p-2 border rounded">
+            <option>None</option>
+            <option>Check Out</option>
+            <option>Check In</option>
+          </select>
+          <input name="user" placeholder="User" className="w-full p-2 border rounded" />
+          <input name="qty" type="number" defaultValue="1" min="1" className="w-full p-2 border rounded" />
+          <button type="submit" className="w-full bg-green-600 text-white p-2 rounded">
+            Submit
+          </button>
+        </form>
+      </div>
+    </details>
+  );
+});
+
 export default function InventoryClient() {
   const [items, setItems] = useState<Item[]>([]);
   const [txs, setTxs] = useState<Tx[]>([]);
   const [loading, setLoading] = useState(true);
+  const [page, setPage] = useState(0);
 
-  useEffect(() => { loadItems(); loadTxs(); }, []);
-
-  async function loadItems() {
-    const { data } = await supabase.from('inventory').select('*').order('location');
-    setItems(data || []); setLoading(false);
-  }
+  useEffect(() => {
+    fetchItems().then(rows => { setItems(rows); setLoading(false); });
+    fetchTxs().then(setTxs);
+  }, []);
 
-  async function loadTxs() {
-    const { data } = await supabase.from('transactions').select('*').order('timestamp', { ascending: false }).limit(100);
-    setTxs(data || []);
-  }
+  const txTimes = useMemo(() => txs.map(tx => format(new Date(tx.timestamp), 'MM/dd HH:mm')), [txs]);
 
   const handleAdd = async (e: React.FormEvent) => {
     e.preventDefault();
     const f = e.target as HTMLFormElement;
     const item = f.item.value.trim();
-    const loc = f.loc.value.trim().toUpperCase().replace(/[^0-9A-Z]/g, '');
+    const loc = cleanLocation(f.loc.value);
     const qty = parseInt(f.qty.value) || 0;
     const notes = f.notes.value;
 
-    if (!item || !loc || !/^\d{1,3}[A-Z]$/.test(loc)) return alert('Invalid location');
+    if (!item || !loc) return alert('Invalid location');
 
-    await supabase.from('inventory').insert({ item, location: loc, quantity: qty, notes });
-    f.reset(); loadItems();
+    const { data, error } = await supabase.from('inventory').insert({ item, location: loc, quantity: qty, notes }).select(ITEM_COLS).single();
+    if (error) return alert(`Add failed: ${error.message}`);
+    f.reset();
+    if (data) setItems(prev => insertSorted(prev, data));
   };
 
-  const updateNotes = async (id: number, notes: string) => {
-    await supabase.from('inventory').update({ notes }).eq('id', id);
-    loadItems();
+  const handleImport = async (e: React.FormEvent) => {
+    e.preventDefault();
+    const f = e.target as HTMLFormElement;
+    const parsed = parseRows(f.rows.value);
+    const rows: Omit<Item, 'id'>[] = [];
+
+    // Same column order as the CSV export; accepts its header row and tab-separated spreadsheet pastes.
+    for (let n = 0; n < parsed.length; n++) {
+      const { line, fields, open } = parsed[n];
+      const [rawLoc = '', item = '', qty = '', notes = ''] = fields;
+      if (n === 0 && rawLoc.trim().toLowerCase() === 'location') continue;
+      const location = cleanLocation(rawLoc);
+      if (open || fields.length > 4 || !item.trim() || !location || !QTY_PATTERN.test(qty)) return alert(`Invalid row ${line}`);
+      rows.push({ item: item.trim(), location, quantity: parseInt(qty), notes });
+    }
+    if (!rows.length) return;
+
+    const { data, error } = await supabase.from('inventory').insert(rows).select(ITEM_COLS);
+    if (error) return alert(`Import failed: ${error.message}`);
+    f.reset();
+    if (data) setItems(prev => [...prev, ...data].sort(byLocation));
   };
 
-  const handleAction = async (row: Item, action: string, user: string, qty: number) => {
+  const updateNotes = useCallback(async (row: Item, notes: string) => {
+    if (notes === (row.notes || '')) return;
+    const { error } = await supabase.from('inventory').update({ notes }).eq('id', row.id);
+    if (error) return alert(`Saving notes failed: ${error.message}`);
+    setItems(prev => prev.map(it => it.id === row.id ? { ...it, notes } : it));
+  }, []);
+
+  const handleAction = useCallback(async (row: Item, action: string, user: string, qty: number) => {
     if (!user.trim()) return alert('Enter user');
-    await supabase.from('transactions').insert({ item: row.item, action, user, qty, timestamp: new Date() });
-    const newQty = action === 'Check Out' ? row.quantity - qty : row.quantity + qty;
-    await supabase.from('inventory').update({ quantity: Math.max(0, newQty) }).eq('id', row.id);
-    loadItems(); loadTxs();
-  };
+    const { data: quantity, error } = await supabase.rpc('record_transaction', { p_item_id: row.id, p_action: action, p_user: user, p_qty: qty });
+    if (error) return alert(`${action} failed: ${error.message}`);
+    if (quantity != null) setItems(prev => prev.map(it => it.id === row.id ? { ...it, quantity } : it));
+    fetchTxs().then(setTxs);
+  }, []);
 
   if (loading) return <div className="p-8 text-2xl text-center">Loading...</div>;
 
+  const pageCount = Math.max(1, Math.ceil(items.length / PAGE_SIZE));
+  const current = Math.min(page, pageCount - 1);
+  const pageItems = items.slice(current * PAGE_SIZE, (current + 1) * PAGE_SIZE);
+
   return (
     <div className="p-6 max-w-6xl mx-auto">
       <h1 className="text-4xl font-bold text-center text-blue-700 mb-8">CNC1 Tool Crib</h1>
@@ -65,47 +207,34 @@ export default function InventoryClient() {
         <button type="submit" className="bg-blue-600 text-white p-3 rounded font-bold">Add</button>
       </form>
 
+      <details className="bg-white p-6 rounded-xl shadow mb-8">
+        <summary className="font-bold cursor-pointer">Import rows</summary>
+        <form onSubmit={handleImport} className="mt-3 space-y-3">
+          <textarea name="rows" placeholder="Location,Item,Quantity,Notes — one per line, comma or tab separated" className="w-full p-3 border rounded" rows={5} />
+          <button type="submit" className="bg-blue-600 text-white px-6 py-3 rounded font-bold">Import</button>
+        </form>
+      </details>
+
       <div className="grid grid-cols-1 lg:grid-cols-3 gap-8">
         <div className="lg:col-span-2 space-y-4">
-          {items.map(row => (
-            <details key={row.id} className="border p-4 bg-white rounded shadow">
-              <summary className="font-bold text-lg cursor-pointer">
-                {row.item} @ {row.location} — Qty: {row.quantity}
-              </summary>
-              <div className="mt-3 grid grid-cols-1 md:grid-cols-2 gap-3 text-sm">
-                <textarea defaultValue={row.notes || ''} onBlur={e => updateNotes(row.id, e.target.value)} className="p-2 border rounded" rows={2} />
-                <div className="space-y-1">
-                  <select defaultValue="None" className="w-full p-2 border rounded">
-                    <option>None</option>
-                    <option>Check Out</option>
-                    <option>Check In</option>
-                  </select>
-                  <input placeholder="User" className="w-full p-2 border rounded" />
-                  <input type="number" defaultValue="1" min="1" className="w-full p-2 border rounded" />
-                  <button
-                    onClick={() => {
-                      const parent = (document.activeElement as HTMLElement)?.closest('details');
-                      const select = parent?.querySelector('select') as HTMLSelectElement;
-                      const user = (parent?.querySelector('input[placeholder="User"]') as HTMLInputElement)?.value;
-                      const qty = parseInt((parent?.querySelector('input[type="number"]') as HTMLInputElement)?.value || '1');
-                      if (select?.value !== 'None' && user) handleAction(row, select.value, user, qty);
-                    }}
-                    className="w-full bg-green-600 text-white p-2 rounded"
-                  >
-                    Submit
-                  </button>
-                </div>
-              </div>
-            </details>
+          {pageItems.map(row => (
+            <ItemRow key={row.id} row={row} onNotes={updateNotes} onAction={handleAction} />
           ))}
+          {pageCount > 1 && (
+            <div className="flex items-center justify-center gap-4">
+              <button onClick={() => setPage(current - 1)} disabled={current === 0} className="px-4 py-2 border rounded bg-white disabled:opacity-50">Prev</button>
+              <span>Page {current + 1} of {pageCount}</span>
+              <button onClick={() => setPage(current + 1)} disabled={current === pageCount - 1} className="px-4 py-2 border rounded bg-white disabled:opacity-50">Next</button>
+            </div>
+          )}
         </div>
 
         <div>
           <h2 className="text-xl font-bold mb-3">Recent TX</h2>
           <div className="space-y-2 text-sm">
-            {txs.map(tx => (
+            {txs.map((tx, i) => (
               <div key={tx.id} className="border-b pb-2">
-                <div className="text-xs text-gray-500">{format(new Date(tx.timestamp), 'MM/dd HH:mm')}</div>
+                <div className="text-xs text-gray-500">{txTimes[i]}</div>
                 <div>{tx.action} {tx.qty}× {tx.item}</div>
                 <div className="text-gray-600">by {tx.user}</div>
               </div>
@@ -117,13 +246,15 @@ export default function InventoryClient() {
       <div className="mt-8 text-center">
         <button
           onClick={() => {
-            const csv = [['Location','Item','Quantity','Notes'], ...items.map(i => [i.location, i.item, i.quantity, i.notes || ''])].map(r => r.join(',')).join('\n');
-            const blob = new Blob([csv], { type: 'text/csv' });
+            const lines = ['Location,Item,Quantity,Notes\n', ...items.map(i => [i.location, i.item, i.quantity, i.notes || ''].map(csvField).join(',') + '\n')];
+            const blob = new Blob(lines, { type: 'text/csv' });
             const url = URL.createObjectURL(blob);
             const a = document.createElement('a');
             a.href = url;
             a.download = 'tool_crib.csv';
             a.click();
+            // Some browsers start the download asynchronously; revoking too early cancels it.
+            setTimeout(() => URL.revokeObjectURL(url), 30_000);
           }}
           className="bg-purple-600 text-white px-6 py-3 rounded"
         >
@@ -0,0 +1,7 @@
+-- Indexes for the queries InventoryClient issues on every load.
+
+-- inventory: select ... order by location
+create index if not exists inventory_location_idx on inventory (location);
+
+-- transactions: select ... order by timestamp desc limit 100
+create index if not exists transactions_timestamp_idx on transactions ("timestamp" desc);
@@ -0,0 +1,35 @@
+-- Logs a check-in/check-out and adjusts the item's quantity in one statement,
+-- so the client makes a single round trip and the quantity is never computed
+-- from a stale read. Returns the new quantity.
+--
+-- The function is callable directly through PostgREST, so it validates its own
+-- arguments rather than relying on the client form.
+create or replace function record_transaction(p_item_id bigint, p_action text, p_user text, p_qty integer)
+returns integer
+language plpgsql
+as $$
+declare
+  new_qty integer;
+begin
+  if p_qty is null or p_qty <= 0 then
+    raise exception 'qty must be a positive integer, got %', p_qty;
+  end if;
+  if p_action is null or p_action not in ('Check In', 'Check Out') then
+    raise exception 'action must be ''Check In'' or ''Check Out'', got %', p_action;
+  end if;
+
+  with tx as (
+    insert into transactions (item, action, "user", qty, "timestamp")
+    select item, p_action, p_user, p_qty, now() from inventory where id = p_item_id
+  )
+  update inventory
+     set quantity = greatest(0, quantity + case when p_action = 'Check Out' then -p_qty else p_qty end)
+   where id = p_item_id
+  returning quantity into new_qty;
+
+  if not found then
+    raise exception 'inventory item % not found', p_item_id;
+  end if;
+  return new_qty;
+end;
+$$;